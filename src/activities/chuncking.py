@@ -1,37 +1,51 @@
 from application.app import app
+from bisect import bisect_right
 from chonkie import SentenceChunker
+from itertools import accumulate
 from typing import List, Dict
 
+# Built once per worker process: constructing the chunker loads the gpt2
+# tokenizer, which is far more expensive than chunking a single document.
+_chunker = None
+
+def get_chunker() -> SentenceChunker:
+    global _chunker
+    if _chunker is None:
+        _chunker = SentenceChunker(
+            tokenizer="gpt2",
+            chunk_size=512,
+            chunk_overlap=128,
+            min_sentences_per_chunk=1
+        )
+    return _chunker
+
 @app.function_name(name="chunking")
 @app.activity_trigger(input_name="document")
 def chunking(document: Dict) -> List[str]:
-    chunker = SentenceChunker(
-        tokenizer="gpt2",
-        chunk_size=512,
-        chunk_overlap=128,
-        min_sentences_per_chunk=1
-    )
-    only_text_pages = [page for page in document["pages"]]
-    all_text = "".join(only_text_pages)
+    return chunk_document(document)
+
+def chunk_document(document: Dict) -> List[str]:
+    chunker = get_chunker()
+    pages = document["pages"]
+    all_text = "".join(pages)
     chunks = chunker.chunk(all_text)
+    page_offsets = list(accumulate(map(len, pages)))
     chunks_with_page_numbers = []
     for chunk in chunks:
         chunks_with_page_numbers.append({
             "filename": document["filename"],
             "url": document["url"],
             "text": chunk.text,
-            "start_page": get_page_number(chunk.start_index, only_text_pages),
-            "end_page": get_page_number(chunk.end_index, only_text_pages),
+            "start_page": get_page_number(chunk.start_index, page_offsets),
+            "end_page": get_page_number(chunk.end_index, page_offsets),
             "start_index": chunk.start_index,
             "end_index": chunk.end_index,
             "token_count": chunk.token_count,
         })
     return chunks_with_page_numbers
 
-def get_page_number(position: int, pages: List[str]) -> int:
-    position -= 1
-    for page_number, page_content in enumerate(pages):
-        if position < len(page_content):
-            return page_number
-        position -= len(page_content)
-    raise ValueError("Position out of range")
\ No newline at end of file
+def get_page_number(position: int, page_offsets: List[int]) -> int:
+    page_number = bisect_right(page_offsets, position - 1)
+    if page_number == len(page_offsets):
+        raise ValueError("Position out of range")
+    return page_number
\ No newline at end of file
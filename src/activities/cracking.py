@@ -1,17 +1,28 @@
 from application.app import app
+from application.identity import get_credential
 import os
-from azure.identity import DefaultAzureCredential
 from azure.ai.documentintelligence import DocumentIntelligenceClient
 from azure.ai.documentintelligence.models import AnalyzeDocumentRequest, AnalyzeResult
 from urllib.parse import unquote, urlparse
 from typing import List
 
+# Created once per worker process so the credential and its HTTP connection
+# pool are reused across activity invocations.
+_client = None
+
+def get_client() -> DocumentIntelligenceClient:
+    global _client
+    if _client is None:
+        _client = DocumentIntelligenceClient(os.getenv('DI_ENDPOINT'), get_credential())
+    return _client
+
 @app.function_name(name="document_cracking")
 @app.activity_trigger(input_name="bloburl")
 def document_cracking(bloburl: str) -> List[str]:
-    endpoint = os.getenv('DI_ENDPOINT')
+    return crack_document(bloburl)
 
-    client = DocumentIntelligenceClient(endpoint, DefaultAzureCredential())
+def crack_document(bloburl: str) -> List[str]:
+    client = get_client()
     poller = client.begin_analyze_document("prebuilt-layout", AnalyzeDocumentRequest(url_source=bloburl))
     result: AnalyzeResult = poller.result()
 
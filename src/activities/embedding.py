@@ -1,22 +1,100 @@
 from application.app import app
+from application.identity import get_credential
+from array import array
+import hashlib
 import os
-from azure.identity import DefaultAzureCredential, get_bearer_token_provider
+import threading
+from azure.identity import get_bearer_token_provider
+from collections import OrderedDict
 from openai import AzureOpenAI
 from typing import List, Dict
 
+# Created once per worker process so the token provider and the client's
+# HTTP connection pool are reused across activity invocations.
+_client = None
+
+def get_client() -> AzureOpenAI:
+    global _client
+    if _client is None:
+        token_provider = get_bearer_token_provider(
+            get_credential(), "https://cognitiveservices.azure.com/.default"
+        )
+        _client = AzureOpenAI(
+            api_version="2024-02-15-preview",
+            azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
+            azure_ad_token_provider=token_provider,
+        )
+    return _client
+
+# Exact-match embedding cache keyed by a hash of the chunk text.
+# Re-indexing runs re-embed mostly unchanged chunks, so hits skip the
+# OpenAI call entirely. Bounded LRU, with vectors packed as float32
+# arrays (~12 KB each instead of ~100 KB as Python float lists) so a
+# full cache stays around 50 MB; the index stores Single precision, so
+# nothing is lost in the round-trip.
+_embedding_cache = OrderedDict()
+# The worker runs sync activities on a thread pool, so concurrent
+# invocations share this cache; the lock keeps get/move/evict atomic.
+_embedding_cache_lock = threading.Lock()
+_EMBEDDING_CACHE_SIZE = 4096
+
+# Azure OpenAI embeddings accept at most 2048 inputs and 300k total tokens
+# per request, so large documents are packed greedily into conforming
+# batches instead of being sent as one unbounded call.
+_MAX_BATCH_INPUTS = 2048
+_MAX_BATCH_TOKENS = 300_000
+
+def batch_by_token_budget(chunks: List[Dict]) -> List[List[int]]:
+    batches = []
+    batch = []
+    batch_tokens = 0
+    for i, chunk in enumerate(chunks):
+        # token_count comes from the chunking activity; fall back to the
+        # usual chars/4 estimate for callers that did not set it.
+        tokens = chunk.get("token_count") or len(chunk["text"]) // 4
+        if batch and (len(batch) >= _MAX_BATCH_INPUTS or batch_tokens + tokens > _MAX_BATCH_TOKENS):
+            batches.append(batch)
+            batch = []
+            batch_tokens = 0
+        batch.append(i)
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+def _cache_get(key: bytes):
+    with _embedding_cache_lock:
+        packed = _embedding_cache.get(key)
+        if packed is None:
+            return None
+        _embedding_cache.move_to_end(key)
+    return list(packed)
+
+def _cache_put(key: bytes, embedding: List[float]):
+    packed = array('f', embedding)
+    with _embedding_cache_lock:
+        _embedding_cache[key] = packed
+        _embedding_cache.move_to_end(key)
+        if len(_embedding_cache) > _EMBEDDING_CACHE_SIZE:
+            _embedding_cache.popitem(last=False)
+
 @app.function_name(name="embedding")
 @app.activity_trigger(input_name="chunks")
 def embedding(chunks: List[Dict]) -> List[Dict]:
-    endpoint = os.getenv('AZURE_OPENAI_ENDPOINT')
-    token_provider = get_bearer_token_provider(
-        DefaultAzureCredential(), "https://cognitiveservices.azure.com/.default"
-    )
-    client = AzureOpenAI(
-        api_version="2024-02-15-preview",
-        azure_endpoint=endpoint,
-        azure_ad_token_provider=token_provider,
-    )
-    embeddings = client.embeddings.create(input = [chunk["text"] for chunk in chunks], model="embedding")
-    for i, chunk in enumerate(chunks):
-        chunk["embedding"] = embeddings.data[i].embedding 
+    return embed_chunks(chunks)
+
+def embed_chunks(chunks: List[Dict]) -> List[Dict]:
+    keys = [hashlib.blake2b(chunk["text"].encode("utf-8"), digest_size=16).digest() for chunk in chunks]
+    embeddings = [_cache_get(key) for key in keys]
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    if missing:
+        client = get_client()
+        for batch in batch_by_token_budget([chunks[i] for i in missing]):
+            response = client.embeddings.create(input=[chunks[missing[j]]["text"] for j in batch], model="embedding")
+            for j, data in zip(batch, response.data):
+                i = missing[j]
+                embeddings[i] = data.embedding
+                _cache_put(keys[i], data.embedding)
+    for chunk, embedding in zip(chunks, embeddings):
+        chunk["embedding"] = embedding
     return chunks
\ No newline at end of file
@@ -5,14 +5,50 @@ import azure.durable_functions as df
 from azure.storage.blob import BlobServiceClient
 import os
 from application.app import app
-from azure.identity import DefaultAzureCredential
+from application.identity import get_credential
 from azure.storage.blob import generate_blob_sas, BlobSasPermissions
 from urllib.parse import quote
 import datetime
 
+# Shared across activity invocations so the credential and HTTP connection
+# pool are reused instead of being rebuilt per call.
+_blob_service_client = None
+
+# The user delegation key is a network round-trip to fetch, so it is cached
+# and refreshed while it still has more validity left than the 1-hour SAS
+# tokens signed with it, keeping every issued SAS within the key's lifetime.
+_user_delegation_key = None
+_user_delegation_key_expiry = None
+_UDK_LIFETIME = datetime.timedelta(hours=2)
+_UDK_REFRESH_MARGIN = datetime.timedelta(minutes=65)
+
+def get_blob_service_client() -> BlobServiceClient:
+    global _blob_service_client
+    if _blob_service_client is None:
+        source_account_name = os.getenv("SOURCE_STORAGE_ACCOUNT_NAME")
+        _blob_service_client = BlobServiceClient(
+            account_url=f'https://{source_account_name}.blob.core.windows.net/',
+            credential=get_credential()
+        )
+    return _blob_service_client
+
+def get_user_delegation_key(blob_service_client: BlobServiceClient, now: datetime.datetime):
+    global _user_delegation_key, _user_delegation_key_expiry
+    if _user_delegation_key is None or _user_delegation_key_expiry - now < _UDK_REFRESH_MARGIN:
+        expiry = now + _UDK_LIFETIME
+        _user_delegation_key = blob_service_client.get_user_delegation_key(
+            key_start_time=now,
+            key_expiry_time=expiry
+        )
+        _user_delegation_key_expiry = expiry
+    return _user_delegation_key
+
 @app.function_name(name="list_blobs_chunk")
 @app.activity_trigger(input_name="params")
 def list_blobs_chunk(params: dict):
+    return list_blobs_page(params)
+
+def list_blobs_page(params: dict):
     container_name = params.get("container_name")
     continuation_token = params.get("continuation_token")
     prefix_list_offset = params.get("prefix_list_offset", 0)
@@ -26,12 +62,9 @@ def list_blobs_chunk(params: dict):
             "prefix_list_offset": prefix_list_offset
         }
 
-    # Use connection string from Application Settings (local.settings.json for local dev)
+    # Account name comes from Application Settings (local.settings.json for local dev)
     source_account_name = os.getenv("SOURCE_STORAGE_ACCOUNT_NAME")
-    source_blob_service_client = BlobServiceClient(  
-        account_url=f'https://{source_account_name}.blob.core.windows.net/',
-        credential=DefaultAzureCredential()
-    )
+    source_blob_service_client = get_blob_service_client()
     container_client = source_blob_service_client.get_container_client(container_name)
 
     # List blobs in a segment (page) using a continuation token
@@ -41,10 +74,11 @@ def list_blobs_chunk(params: dict):
         results_per_page=chunk_size
     )
     
-    user_delegation_key = source_blob_service_client.get_user_delegation_key(
-        key_start_time=datetime.datetime.now(datetime.timezone.utc),
-        key_expiry_time=datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)
-    )
+    # One clock read per call: the delegation-key freshness check and every
+    # SAS token in this page share the same timestamps.
+    now = datetime.datetime.now(datetime.timezone.utc)
+    sas_expiry = now + datetime.timedelta(hours=1)
+    user_delegation_key = get_user_delegation_key(source_blob_service_client, now)
 
     new_continuation_token = None
     pages = result_segment.by_page(continuation_token=continuation_token)
@@ -56,7 +90,7 @@ def list_blobs_chunk(params: dict):
                 blob_name=blob.name,
                 user_delegation_key=user_delegation_key,
                 permission=BlobSasPermissions(read=True),
-                expiry=datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)
+                expiry=sas_expiry
             )
             blob_urls.append(
                 f"https://{source_account_name}.blob.core.windows.net/{container_name}/{quote(blob.name)}?{sas_token}"
@@ -1,4 +1,5 @@
-import base64
+import asyncio
+import hashlib
 import logging
 import os
 import re
@@ -26,7 +27,7 @@ from azure.core.credentials import AzureKeyCredential
 from azure.core.credentials_async import AsyncTokenCredential
 from azure.search.documents.indexes.aio import SearchIndexClient
 from application.app import app
-from azure.identity import DefaultAzureCredential
+from application.identity import get_async_credential
 from urllib.parse import urlsplit
 from typing import List, Dict
 
@@ -191,10 +192,11 @@ class SearchManager:
         
         def filename_to_id(filename: str):
             filename_ascii = re.sub("[^0-9a-zA-Z_-]", "_", filename)
-            filename_hash = base64.b16encode(filename.encode("utf-8")).decode("ascii")
-        
+            filename_hash = hashlib.blake2b(filename.encode("utf-8"), digest_size=16).hexdigest()
+
             return f"file-{filename_ascii}-{filename_hash}"
         async with self.search_info.create_search_client() as search_client:
+            uploads = []
             for batch_index, batch in enumerate(section_batches):
                 documents = [
                     {
@@ -208,7 +210,9 @@ class SearchManager:
                     for section_index, section in enumerate(batch)
                 ]
 
-                await search_client.upload_documents(documents)
+                uploads.append(search_client.upload_documents(documents))
+
+            await asyncio.gather(*uploads)
                 
                 
 
@@ -218,7 +222,7 @@ async def add_documents(documents: dict) -> List[str]:
     searchManager = SearchManager(
         SearchInfo(
             endpoint=os.getenv("SEARCH_SERVICE_ENDPOINT"),
-            credential=DefaultAzureCredential(),
+            credential=get_async_credential(),
             index_name=documents["index_name"]
         ), AzureOpenAIEmbeddingConfig(
             open_ai_dimensions=3072,
@@ -229,13 +233,21 @@ async def add_documents(documents: dict) -> List[str]:
     )
     await searchManager.update_content(documents["chunks"])
     
+# Index names this worker has already created or seen exist. Indexes are
+# never deleted by the pipeline, so once verified we can skip the
+# list_index_names round-trip that otherwise runs on every orchestration.
+_verified_indexes = set()
+
 @app.function_name(name="ensure_index_exists")
 @app.activity_trigger(input_name="name")
 async def ensure_index_exists(name: str) -> List[str]:
+    if name in _verified_indexes:
+        logger.info("Search index %s already verified, skipping check", name)
+        return
     searchManager = SearchManager(
         SearchInfo(
             endpoint=os.getenv("SEARCH_SERVICE_ENDPOINT"),
-            credential=DefaultAzureCredential(),
+            credential=get_async_credential(),
             index_name=name
         ), AzureOpenAIEmbeddingConfig(
             open_ai_dimensions=3072,
@@ -245,4 +257,4 @@ async def ensure_index_exists(name: str) -> List[str]:
         )
     )
     await searchManager.create_index()
-    
\ No newline at end of file
+    _verified_indexes.add(name)
@@ -0,0 +1,21 @@
+from azure.identity import DefaultAzureCredential
+from azure.identity.aio import DefaultAzureCredential as AsyncDefaultAzureCredential
+
+# One credential per worker process, shared by every activity and HTTP
+# handler: DefaultAzureCredential probes the managed-identity/CLI/env chain
+# on first use and caches tokens internally, so constructing it repeatedly
+# throws both away.
+_credential = None
+_async_credential = None
+
+def get_credential() -> DefaultAzureCredential:
+    global _credential
+    if _credential is None:
+        _credential = DefaultAzureCredential()
+    return _credential
+
+def get_async_credential() -> AsyncDefaultAzureCredential:
+    global _async_credential
+    if _async_credential is None:
+        _async_credential = AsyncDefaultAzureCredential()
+    return _async_credential
@@ -1,12 +1,14 @@
-import json
+import asyncio
 import logging
 import os
+import orjson
+from collections import OrderedDict
 import azure.functions as func
 from azure.durable_functions import DurableOrchestrationClient
 from application.app import app
+from application.identity import get_async_credential
 from azure.search.documents.indexes.aio import SearchIndexClient
 from azure.search.documents.models import VectorQuery
-from azure.identity import DefaultAzureCredential
 from orchestrators.index import index
 from activities.listblob import list_blobs_chunk
 from activities.cracking import document_cracking
@@ -16,17 +18,19 @@ from activities.search import ensure_index_exists, add_documents
 
 
 defaults = {
-    "BLOB_AMOUNT_PARALLEL": int(os.environ.get("BLOB_AMOUNT_PARALLEL", "20")),
+    "BLOB_AMOUNT_PARALLEL": int(os.environ.get("BLOB_AMOUNT_PARALLEL", "100")),
     "SEARCH_INDEX_NAME": os.environ.get("SEARCH_INDEX_NAME", "default-index"),
     "BLOB_CONTAINER_NAME": os.environ.get("BLOB_CONTAINER_NAME", "source")
 }
 
+SEARCH_SERVICE_ENDPOINT = os.getenv("SEARCH_SERVICE_ENDPOINT")
+
 
 @app.function_name(name='index_event_grid')
 @app.event_grid_trigger(arg_name='event')
 @app.durable_client_input(client_name="client")
 async def index_event_grid(event: func.EventGridEvent, client: DurableOrchestrationClient):
-    if event.get_json()["api"] != "PutBlob":
+    if event.get_json().get("api") != "PutBlob":
         logging.info("Event type is not BlobCreated. Skipping execution.")
         return
     
@@ -38,8 +42,8 @@ async def index_event_grid(event: func.EventGridEvent, client: DurableOrchestrat
 
 def extract_path(event: func.EventGridEvent):
     subject = event.subject
-    path_in_container = subject.split("/blobs/", 1)[-1]
-    return path_in_container
+    index = subject.find("/blobs/")
+    return subject[index + len("/blobs/"):] if index >= 0 else subject
 
 @app.function_name(name='status')
 @app.route(route="status", methods=[func.HttpMethod.GET])
@@ -47,7 +51,12 @@ def extract_path(event: func.EventGridEvent):
 async def status(req: func.HttpRequest, client: DurableOrchestrationClient) -> func.HttpResponse:
     logging.info('Retrieving status of all orchestrations.')
     results = await client.get_status_all()
-    return func.HttpResponse(json.dumps([result.to_json() for result in results]), status_code=200)
+    return func.HttpResponse(orjson.dumps([result.to_json() for result in results]), status_code=200, mimetype="application/json")
+
+_TRUE_VALUES = frozenset({"true", "1"})
+
+def str_to_bool(value):
+    return value is not None and value.lower() in _TRUE_VALUES
 
 @app.function_name(name='status_id')
 @app.route(route="status/{id}", methods=[func.HttpMethod.GET])
@@ -55,21 +64,19 @@ async def status(req: func.HttpRequest, client: DurableOrchestrationClient) -> f
 async def status_id(req: func.HttpRequest, client: DurableOrchestrationClient) -> func.HttpResponse:
     logging.info('Retrieving status of all orchestrations.')
     id = req.route_params.get('id')
-    def str_to_bool(value):
-        if value is None:
-            return False
-        return value.lower() in ['true', '1']
-    show_history = str_to_bool(req.params.get('show_history')) or False
-    show_history_output = str_to_bool(req.params.get('show_history_output')) or False
-    show_input = str_to_bool(req.params.get('show_input')) or False
+    show_history = str_to_bool(req.params.get('show_history'))
+    show_history_output = str_to_bool(req.params.get('show_history_output'))
+    show_input = str_to_bool(req.params.get('show_input'))
     result = await client.get_status(instance_id=id, show_history=show_history, show_history_output=show_history_output, show_input=show_input)
     result_json = result.to_json()
     if show_history and hasattr(result, 'historyEvents'):
-        result_json["historyEvents"] = list(result.historyEvents)
+        # Serialize the events as-is: copying them first can double peak
+        # memory since each event may carry the full step input/output.
+        result_json["historyEvents"] = result.historyEvents
     else:
         result_json["historyEvents"] = None
 
-    return func.HttpResponse(json.dumps(result_json), status_code=200)
+    return func.HttpResponse(orjson.dumps(result_json), status_code=200, mimetype="application/json")
 
 @app.function_name(name='index_http')
 @app.route(route="index", methods=[func.HttpMethod.POST])
@@ -95,6 +102,27 @@ async def orchestration_health(req: func.HttpRequest, client: DurableOrchestrati
         logging.error(f"Health check failed: {ex}")
         return func.HttpResponse("Unhealthy", status_code=503)
     
+# Clients are cached per index so the request path reuses the credential's
+# token cache and the warm HTTP connection pool instead of rebuilding both
+# (and paying credential probing) per query. The cache is a bounded LRU
+# because index_name comes from the query string: without a cap, bogus
+# values would each pin an unclosed client and its pool forever.
+_search_clients = OrderedDict()
+_SEARCH_CLIENT_CACHE_SIZE = 8
+
+def get_search_client(endpoint: str, index_name: str):
+    search_client = _search_clients.get(index_name)
+    if search_client is None:
+        search_index_client = SearchIndexClient(endpoint=endpoint, credential=get_async_credential())
+        search_client = search_index_client.get_search_client(index_name=index_name)
+        _search_clients[index_name] = search_client
+        if len(_search_clients) > _SEARCH_CLIENT_CACHE_SIZE:
+            _, evicted = _search_clients.popitem(last=False)
+            asyncio.create_task(evicted.close())
+    else:
+        _search_clients.move_to_end(index_name)
+    return search_client
+
 @app.route(route="search", methods=[func.HttpMethod.GET])
 async def search_index(req: func.HttpRequest) -> func.HttpResponse:
     try:
@@ -105,32 +133,26 @@ async def search_index(req: func.HttpRequest) -> func.HttpResponse:
                 "Please provide a search query using the 'q' parameter.", status_code=400
             )
     
-        # Get search service configuration from environment variables
-        endpoint = os.getenv("SEARCH_SERVICE_ENDPOINT")
-        index_name = req.params.get('index_name') or os.environ.get("SEARCH_INDEX_NAME", "default-index")
+        # Search service configuration is resolved once at import, like `defaults`
+        endpoint = SEARCH_SERVICE_ENDPOINT
+        index_name = req.params.get('index_name') or defaults["SEARCH_INDEX_NAME"]
         if not endpoint or not index_name:
             raise Exception("Missing search service configuration.")
 
-        # Create the async search client
-        search_index_client = SearchIndexClient(endpoint=endpoint, credential=DefaultAzureCredential())
-
         # Execute the search query (using the provided query text)
-        search_client = search_index_client.get_search_client(index_name=index_name)
+        search_client = get_search_client(endpoint, index_name)
         results = await search_client.search(search_text=query,
                                              query_type="semantic",
                                              select="content, sourcepages, id, storageUrl",
                                              semantic_configuration_name="default")
+        # Each result is a dict holding the selected document fields. Consume
+        # per service page and extend in bulk rather than one result at a time.
         docs = []
-        async for result in results:
-            # Each result has a 'document' property that contains the actual document.
-            docs.append(result)
-
-        # Ensure the client is closed properly
-        await search_client.close()  
-        await search_index_client.close()
+        async for page in results.by_page():
+            docs.extend([result async for result in page])
 
         return func.HttpResponse(
-            json.dumps(docs), status_code=200, mimetype="application/json"
+            orjson.dumps(docs), status_code=200, mimetype="application/json"
         )
     except Exception as ex:
         logging.error(f"Search query failed: {ex}")
@@ -2,6 +2,11 @@ from azure.durable_functions import DurableOrchestrationContext, RetryOptions
 from application.app import app
 import os
 
+# Retry policies are immutable, so build them once at import instead of per
+# blob / per orchestration replay.
+DOCUMENT_RETRY_OPTIONS = RetryOptions(first_retry_interval_in_milliseconds=60_000, max_number_of_attempts=3)
+SERVICE_RETRY_OPTIONS = RetryOptions(first_retry_interval_in_milliseconds=3000, max_number_of_attempts=3)
+
 @app.function_name(name="index")  # The name used by client.start_new("index")
 @app.orchestration_trigger(context_name="context")
 def index(context: DurableOrchestrationContext):
@@ -36,10 +41,9 @@ def index(context: DurableOrchestrationContext):
         array_position = blob_list_result["prefix_list_offset"]
         task_list = []
         for blob_name in blob_list_result["blob_names"]:
-            document_retry_options = RetryOptions(first_retry_interval_in_milliseconds=60_000, max_number_of_attempts=3)
             task_list.append(context.call_sub_orchestrator_with_retry(
                 name="index_document",
-                retry_options=document_retry_options,
+                retry_options=DOCUMENT_RETRY_OPTIONS,
                 input_={"blob_url": blob_name, "index_name": index_name}))
         yield context.task_all(task_list)
     
@@ -48,8 +52,7 @@ def index(context: DurableOrchestrationContext):
 @app.orchestration_trigger(context_name="context")
 def index_document(context: DurableOrchestrationContext):
     input = context.get_input()
-    service_retry_options = RetryOptions(first_retry_interval_in_milliseconds=3000, max_number_of_attempts=3)
-    document = yield context.call_activity_with_retry("document_cracking", service_retry_options, input["blob_url"])
+    document = yield context.call_activity_with_retry("document_cracking", SERVICE_RETRY_OPTIONS, input["blob_url"])
     chunks = yield context.call_activity("chunking", document)
-    chunks_with_embeddings = yield context.call_activity_with_retry("embedding", service_retry_options, chunks)
-    yield context.call_activity_with_retry("add_documents",  service_retry_options,{"chunks": chunks_with_embeddings, "index_name": input["index_name"]})
\ No newline at end of file
+    chunks_with_embeddings = yield context.call_activity_with_retry("embedding", SERVICE_RETRY_OPTIONS, chunks)
+    yield context.call_activity_with_retry("add_documents",  SERVICE_RETRY_OPTIONS,{"chunks": chunks_with_embeddings, "index_name": input["index_name"]})
\ No newline at end of file
@@ -60,21 +60,27 @@ def test_e2e_document_indexing():
     assert status_id, "No statusId returned from the indexing endpoint."
     print(f"Indexing started, received status ID: {status_id}")
 
-    # Poll the status endpoint until the indexing is finished.
+    # Poll the status endpoint until the indexing is finished, backing off
+    # from quick checks to a 5 second interval so fast runs finish promptly.
     poll_url = f"{status_endpoint}/{status_id}"
     print("Polling indexing status...")
-    for attempt in range(60):  # adjust the number of retries as needed
+    deadline = time.time() + 300  # adjust the overall timeout as needed
+    delay = 0.5
+    attempt = 0
+    while time.time() < deadline:
+        attempt += 1
         status_resp = requests.get(poll_url)
         status_resp.raise_for_status()
         status = status_resp.json().get('runtimeStatus')
-        print(f"Status check {attempt+1}: {status}")
+        print(f"Status check {attempt}: {status}")
         if status not in ["Pending", "Running", "Completed"]:
             print(f"ERROR: Document indexing did not finish. Reason: {status_resp.json()}")
             assert False, "Document indexing did not finish."
         if status == "Completed":
             print("Indexing completed successfully.")
             break
-        time.sleep(5)
+        time.sleep(delay)
+        delay = min(delay * 1.7, 5)
     else:
         print("ERROR: Document indexing did not finish within the expected time.")
         assert False, "Document indexing did not finish within the expected time."